@@ -1,8 +1,16 @@
+import json
+
 import streamlit as st
 import pandas as pd
 import numpy as np
+import numba
 import plotly.express as px
-from collections import Counter
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.feather as pa_feather
+from pathlib import Path
 
 # Page configuration
 st.set_page_config(
@@ -25,32 +33,468 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+@numba.njit(cache=True)
+def group_mean_count(codes, values, n_groups):
+    """Per-group mean and count of values, grouped by categorical codes.
+
+    Skips NaN values and negative codes (missing categories). A single
+    compiled pass over the rows replaces pandas' generic groupby path.
+    """
+    sums = np.zeros(n_groups, dtype=np.float64)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(codes.shape[0]):
+        c = codes[i]
+        v = values[i]
+        if c >= 0 and not np.isnan(v):
+            sums[c] += v
+            counts[c] += 1
+    means = np.full(n_groups, np.nan, dtype=np.float64)
+    for g in range(n_groups):
+        if counts[g] > 0:
+            means[g] = sums[g] / counts[g]
+    return means, counts
+
+@numba.njit(cache=True)
+def count_note_codes(offsets, codes, rows, n_tokens):
+    """Count dictionary-encoded note tokens over the selected rows.
+
+    offsets/codes describe the flattened list<string> column; rows are
+    the filtered row indices. Counting integer codes keeps the hot loop
+    free of Python string objects; tokens are decoded only for the
+    final top-N.
+    """
+    counts = np.zeros(n_tokens, dtype=np.int64)
+    for i in range(rows.shape[0]):
+        r = rows[i]
+        for j in range(offsets[r], offsets[r + 1]):
+            counts[codes[j]] += 1
+    return counts
+
+def top_groups_by_mean_rating(col, idx, top_n=15):
+    """Top-N categories of `col` by mean Rating Value over rows `idx`."""
+    categories = df[col].cat.categories
+    codes = filter_codes[col][idx]
+    values = column_values('Rating Value', idx)
+    means, counts = group_mean_count(codes, values, len(categories))
+    top = np.flatnonzero(counts > 0)
+    top = top[np.argsort(-means[top])][:top_n]
+    return pd.Series(means[top], index=categories[top], name='mean')
+
 # Load data with caching
 @st.cache_data
 def load_data():
+    """Load the dataset and precompute the sidebar filter options.
+
+    Returns (df, options) where options holds the sorted unique values
+    for each filter column, computed once under the cache so widget
+    interactions don't rescan the columns.
+    """
     try:
-        # The CSV is semicolon-delimited
-        df = pd.read_csv('fra_cleaned.csv', encoding='latin-1', sep=';', on_bad_lines='skip', engine='python')
-        
+        # Parse the CSV once and persist it as Feather; later cold starts
+        # memory-map the columnar file instead of re-parsing text. The
+        # slow tolerant parse (bad-row skipping) thus happens exactly
+        # once per dataset version: a stale artifact is rebuilt when the
+        # source CSV is newer.
+        feather_path = Path('fra_cleaned.feather')
+        csv_path = Path('fra_cleaned.csv')
+        if feather_path.exists() and (
+            not csv_path.exists()
+            or feather_path.stat().st_mtime >= csv_path.stat().st_mtime
+        ):
+            table = pa_feather.read_table(feather_path, memory_map=True)
+        else:
+            # The CSV is semicolon-delimited and latin-1 encoded; parse it
+            # with pyarrow's multi-threaded reader instead of the slow
+            # Python engine. decimal_point=',' lets pyarrow infer Rating
+            # Value as a double directly (the file uses comma decimals),
+            # so no to_numeric pass is needed afterwards.
+            table = pa_csv.read_csv(
+                csv_path,
+                read_options=pa_csv.ReadOptions(encoding='latin-1'),
+                parse_options=pa_csv.ParseOptions(delimiter=';', invalid_row_handler=lambda row: 'skip'),
+                convert_options=pa_csv.ConvertOptions(decimal_point=',')
+            )
+            pa_feather.write_feather(table, feather_path, compression='zstd')
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+
         # Clean column names (remove spaces and convert to proper names)
         df.columns = df.columns.str.strip()
-        
-        # Convert numeric columns, handling errors gracefully
-        numeric_cols = ['Rating Value', 'Rating Count', 'Year']
-        for col in numeric_cols:
+
+        # Strip stray whitespace from the string values once here, so no
+        # rerun path ever needs to re-normalize (or re-allocate) strings
+        for col in df.columns:
+            dtype = df[col].dtype
+            if isinstance(dtype, pd.ArrowDtype) and pa.types.is_string(dtype.pyarrow_dtype):
+                df[col] = df[col].str.strip()
+
+        # Narrow numeric dtypes - halves the bytes scanned by the
+        # histogram, top-N and per-group mean reductions downstream
+        narrow_dtypes = {
+            'Rating Value': 'float[pyarrow]',   # float32
+            'Rating Count': 'int32[pyarrow]',
+            'Year': 'int16[pyarrow]',
+        }
+        for col, dtype in narrow_dtypes.items():
             if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        return df
+                df[col] = df[col].astype(dtype)
+
+        # The notes text is immutable, so tokenize it once here; counting
+        # notes at rerun time is then a flatten + value_counts over the
+        # Arrow list buffers with no per-row Python string work
+        for col in ['Top', 'Middle', 'Base']:
+            if col in df.columns:
+                tokens = pc.utf8_split_whitespace(pa.array(df[col]))
+                df[col] = pd.Series(tokens, index=df.index, dtype=pd.ArrowDtype(pa.list_(pa.string())))
+
+        # The filter columns are low-cardinality; as categoricals the
+        # isin/value_counts hot paths compare small integer codes instead
+        # of hashing strings on every sidebar interaction.
+        for col in ['Brand', 'Country', 'Gender']:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        # Categorical categories are already unique and sorted
+        options = {
+            'brands': df['Brand'].cat.categories.tolist(),
+            'countries': df['Country'].cat.categories.tolist(),
+            'genders': df['Gender'].cat.categories.tolist(),
+        }
+
+        # Integer code arrays for the filter columns; the rerun-time mask
+        # is built over these instead of the string values
+        codes = {col: df[col].cat.codes.to_numpy() for col in ['Brand', 'Country', 'Gender']}
+
+        return df, options, codes
     except FileNotFoundError:
         st.error("❌ Dataset file 'fra_cleaned.csv' not found.")
-        return None
+        return None, None, None
     except Exception as e:
         st.error(f"❌ Error loading dataset: {str(e)}")
-        return None
+        return None, None, None
 
 # Load the dataset
-df = load_data()
+df, filter_options, filter_codes = load_data()
+
+@st.cache_resource
+def load_table(_df):
+    """Shared Arrow view of the dataset.
+
+    The tab aggregates slice single columns out of this table instead of
+    materializing intermediate DataFrames; cache_resource keeps one copy
+    per process since the table is never mutated.
+    """
+    return pa.Table.from_pandas(_df, preserve_index=False).replace_schema_metadata(None)
+
+pa_table = load_table(df) if df is not None else None
+
+@st.cache_resource
+def load_note_codes(_table):
+    """Dictionary-encoded token arrays for the notes columns.
+
+    For each column: the list offsets, the int32 token codes of the
+    flattened tokens, and the token vocabulary. The per-filter counting
+    kernel runs entirely over these integer arrays.
+    """
+    out = {}
+    for col in ('Top', 'Middle', 'Base'):
+        arr = _table.column(col).combine_chunks()
+        encoded = arr.values.dictionary_encode()
+        out[col] = (
+            arr.offsets.to_numpy(),
+            encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32),
+            encoded.dictionary.to_pylist(),
+        )
+    return out
+
+note_codes = load_note_codes(pa_table) if pa_table is not None else None
+
+def filter_mask(filter_key):
+    """Boolean row mask for a hashable filter key.
+
+    The key is (brands, countries, genders) as sorted tuples; building
+    the mask from the precomputed code arrays is cheap, so cached
+    aggregates can take the key instead of an unhashable DataFrame.
+    """
+    sel_brands, sel_countries, sel_genders = filter_key
+    return (
+        np.isin(filter_codes['Brand'], df['Brand'].cat.categories.get_indexer(list(sel_brands))) &
+        np.isin(filter_codes['Country'], df['Country'].cat.categories.get_indexer(list(sel_countries))) &
+        np.isin(filter_codes['Gender'], df['Gender'].cat.categories.get_indexer(list(sel_genders)))
+    )
+
+def apply_filters(filter_key):
+    """Rebuild the filtered frame from a hashable filter key."""
+    return df.iloc[np.flatnonzero(filter_mask(filter_key))]
+
+def filtered_indices(filter_key):
+    """Row indices for the key, falling back to all rows when empty."""
+    idx = np.flatnonzero(filter_mask(filter_key))
+    if idx.size == 0:
+        idx = np.arange(len(df), dtype=np.int64)
+    return idx
+
+def column_values(name, idx):
+    """Numeric column slice from the Arrow table, float64 with NaN nulls."""
+    return pa_table.column(name).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)[idx]
+
+def category_counts(col, idx, top_n=None):
+    """value_counts equivalent via bincount over the categorical codes.
+
+    Only observed categories are returned, matching value_counts on the
+    original object-dtype columns.
+    """
+    categories = df[col].cat.categories
+    codes = filter_codes[col][idx]
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    order = np.argsort(-counts, kind='stable')
+    order = order[counts[order] > 0]
+    if top_n is not None:
+        order = order[:top_n]
+    return pd.Series(counts[order], index=categories[order], name='count')
+
+def top_n_indices(vals, n=10):
+    """Positions of the N largest values, sorted descending.
+
+    O(N) argpartition selection instead of a full sort; NaNs are mapped
+    to -inf and excluded, matching nlargest semantics.
+    """
+    vals = np.nan_to_num(vals, nan=-np.inf)
+    if len(vals) > n:
+        idx = np.argpartition(vals, -n)[-n:]
+    else:
+        idx = np.arange(len(vals))
+    idx = idx[vals[idx] > -np.inf]
+    return idx[np.argsort(-vals[idx])]
+
+def top_n_table(col, idx, n=10):
+    """Top-N rows by `col` over rows `idx`, as a small display frame."""
+    top = idx[top_n_indices(column_values(col, idx), n)]
+    return pa_table.select(['Perfume', 'Brand', col]).take(top).to_pandas()
+
+def get_top_notes(col_name, idx, top_n=15):
+    """Extract and count notes from column"""
+    if col_name not in note_codes:
+        return {}
+    offsets, codes, vocab = note_codes[col_name]
+    counts = count_note_codes(offsets, codes, idx, len(vocab))
+    result = {}
+    for i in np.argsort(-counts, kind='stable'):
+        token = vocab[i]
+        # Skip empty tokens left over from whitespace splitting
+        if token and counts[i] > 0:
+            result[token] = int(counts[i])
+            if len(result) == top_n:
+                break
+    return result
+
+# Per-tab aggregates, cached on the filter key so tab switches and
+# repeated selections are dict lookups instead of recomputation
+@st.cache_data
+def compute_value_counts(filter_key):
+    """All three filter-column counts in one prelude, shared by the tabs."""
+    idx = filtered_indices(filter_key)
+    return {col: category_counts(col, idx) for col in ('Brand', 'Country', 'Gender')}
+
+@st.cache_data
+def compute_tab1(filter_key):
+    idx = filtered_indices(filter_key)
+    ratings = column_values('Rating Value', idx)
+    ratings = ratings[~np.isnan(ratings)]
+    hist = np.histogram(ratings, bins=30) if len(ratings) > 0 else None
+    gender_counts = compute_value_counts(filter_key)['Gender']
+    return hist, gender_counts
+
+@st.cache_data
+def compute_tab2(filter_key):
+    idx = filtered_indices(filter_key)
+    ratings = column_values('Rating Value', idx)
+    valid = ratings[~np.isnan(ratings)]
+    stats = (
+        valid.mean() if valid.size > 0 else np.nan,
+        np.median(valid) if valid.size > 0 else np.nan,
+        valid.std(ddof=1) if valid.size > 1 else np.nan,
+    )
+    top_rated = top_n_table('Rating Value', idx)
+    most_reviewed = top_n_table('Rating Count', idx)
+    return stats, top_rated, most_reviewed
+
+@st.cache_data
+def compute_tab3(filter_key):
+    idx = filtered_indices(filter_key)
+    return compute_value_counts(filter_key)['Brand'].head(15), top_groups_by_mean_rating('Brand', idx)
+
+@st.cache_data
+def compute_tab4(filter_key):
+    idx = filtered_indices(filter_key)
+    return compute_value_counts(filter_key)['Country'].head(15), top_groups_by_mean_rating('Country', idx)
+
+@st.cache_data
+def compute_tab5(filter_key):
+    idx = filtered_indices(filter_key)
+    return tuple(get_top_notes(col, idx, 15) for col in ('Top', 'Middle', 'Base'))
+
+def hbar_json(x, y, title, color):
+    """Serialized horizontal bar figure (go.Bar skips the PX wrapper)."""
+    fig = go.Figure(go.Bar(
+        x=x,
+        y=y,
+        orientation='h',
+        marker_color=color
+    ))
+    fig.update_layout(title=title, height=500)
+    return fig.to_json()
+
+# Figure JSON per tab, cached on the filter key: st.plotly_chart would
+# otherwise re-serialize identical figures on every rerun
+@st.cache_data
+def tab1_figure_json(filter_key):
+    rating_hist, gender_counts = compute_tab1(filter_key)
+    rating_json = None
+    if rating_hist is not None:
+        counts, edges = rating_hist
+        centers = 0.5 * (edges[:-1] + edges[1:])
+        fig_rating = px.bar(
+            x=centers,
+            y=counts,
+            title='Rating Distribution',
+            labels={'x': 'Rating Value', 'y': 'count'},
+            color_discrete_sequence=['#FF6B9D']
+        )
+        fig_rating.update_layout(bargap=0)
+        rating_json = fig_rating.to_json()
+    gender_json = None
+    if len(gender_counts) > 0:
+        fig_gender = px.pie(
+            values=gender_counts.values,
+            names=gender_counts.index,
+            title='Fragrances by Gender',
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+        gender_json = fig_gender.to_json()
+    return rating_json, gender_json
+
+@st.cache_data
+def tab3_figure_json(filter_key):
+    brand_counts, brand_ratings = compute_tab3(filter_key)
+    counts_json = None
+    if len(brand_counts) > 0:
+        counts_json = hbar_json(brand_counts.values, brand_counts.index.tolist(), 'Top 15 Brands', '#FF6B9D')
+    ratings_json = None
+    if len(brand_ratings) > 0:
+        ratings_json = hbar_json(brand_ratings.values, brand_ratings.index.tolist(), 'Top 15 Brands by Avg Rating', '#00CC96')
+    return counts_json, ratings_json
+
+@st.cache_data
+def tab4_figure_json(filter_key):
+    country_counts, country_ratings = compute_tab4(filter_key)
+    counts_json = None
+    if len(country_counts) > 0:
+        counts_json = hbar_json(country_counts.values, country_counts.index.tolist(), 'Top 15 Countries', '#636EFA')
+    ratings_json = None
+    if len(country_ratings) > 0:
+        ratings_json = hbar_json(country_ratings.values, country_ratings.index.tolist(), 'Top 15 Countries by Avg Rating', '#AB63FA')
+    return counts_json, ratings_json
+
+@st.cache_data
+def tab5_figure_json(filter_key):
+    notes = compute_tab5(filter_key)
+    colors = ('#FFA15A', '#00CC96', '#636EFA')
+    titles = ('Top Notes', 'Middle Notes', 'Base Notes')
+    return tuple(
+        hbar_json(list(n.values()), list(n.keys()), title, color) if n else None
+        for n, title, color in zip(notes, titles, colors)
+    )
+
+# Tab renderers as fragments: a widget change inside one reruns only
+# that fragment, not every tab's body
+@st.fragment
+def render_overview(filter_key):
+    st.header("Overview Analytics")
+
+    rating_json, gender_json = tab1_figure_json(filter_key)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Rating distribution - binned server-side (30 bars, not rows)
+        if rating_json is not None:
+            st.plotly_chart(json.loads(rating_json), use_container_width=True)
+        else:
+            st.info("No rating data available")
+
+    with col2:
+        # Gender distribution
+        if gender_json is not None:
+            st.plotly_chart(json.loads(gender_json), use_container_width=True)
+
+@st.fragment
+def render_ratings(filter_key):
+    st.header("Ratings Analysis")
+
+    (avg_rating, med_rating, std_rating), top_rated, most_reviewed = compute_tab2(filter_key)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Avg Rating", f"{avg_rating:.2f}" if pd.notna(avg_rating) else "N/A")
+    with col2:
+        st.metric("Median Rating", f"{med_rating:.2f}" if pd.notna(med_rating) else "N/A")
+    with col3:
+        st.metric("Std Dev", f"{std_rating:.2f}" if pd.notna(std_rating) else "N/A")
+
+    # Top rated
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Top 10 Highest Rated")
+        st.dataframe(top_rated, use_container_width=True)
+
+    with col2:
+        st.subheader("Top 10 Most Reviewed")
+        st.dataframe(most_reviewed, use_container_width=True)
+
+@st.fragment
+def render_brands(filter_key):
+    st.header("Top Brands Analysis")
+
+    counts_json, ratings_json = tab3_figure_json(filter_key)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if counts_json is not None:
+            st.plotly_chart(json.loads(counts_json), use_container_width=True)
+
+    with col2:
+        if ratings_json is not None:
+            st.plotly_chart(json.loads(ratings_json), use_container_width=True)
+
+@st.fragment
+def render_geographic(filter_key):
+    st.header("Geographic Distribution")
+
+    counts_json, ratings_json = tab4_figure_json(filter_key)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if counts_json is not None:
+            st.plotly_chart(json.loads(counts_json), use_container_width=True)
+
+    with col2:
+        if ratings_json is not None:
+            st.plotly_chart(json.loads(ratings_json), use_container_width=True)
+
+@st.fragment
+def render_notes(filter_key):
+    st.header("Fragrance Notes Analysis")
+
+    note_jsons = tab5_figure_json(filter_key)
+
+    columns = st.columns(3)
+    for column, subheader, note_json in zip(columns, ("Top Notes", "Middle Notes", "Base Notes"), note_jsons):
+        with column:
+            st.subheader(subheader)
+            if note_json is not None:
+                st.plotly_chart(json.loads(note_json), use_container_width=True)
 
 if df is not None:
     # Title
@@ -73,10 +517,10 @@ if df is not None:
     # Sidebar filters
     st.sidebar.header("🔍 Filters")
     
-    # Get unique values for filters - use consistent casing/stripping
-    brands = sorted(df['Brand'].dropna().unique().astype(str))
-    countries = sorted(df['Country'].dropna().unique().astype(str))
-    genders = sorted(df['Gender'].dropna().unique().astype(str))
+    # Option lists are precomputed inside the cached loader
+    brands = filter_options['brands']
+    countries = filter_options['countries']
+    genders = filter_options['genders']
     
     # Create default selections
     default_brands = brands[:5] if len(brands) > 5 else brands
@@ -95,12 +539,14 @@ if df is not None:
     if not selected_genders:
         selected_genders = default_genders
     
-    # Filter data directly on original columns (no need for _clean columns)
-    filtered_df = df[
-        (df['Brand'].isin(selected_brands)) &
-        (df['Country'].isin(selected_countries)) &
-        (df['Gender'].isin(selected_genders))
-    ]
+    # Hashable, order-independent key for the cached aggregates; the
+    # mask itself is built with np.isin over the int code arrays
+    filter_key = (
+        tuple(sorted(selected_brands)),
+        tuple(sorted(selected_countries)),
+        tuple(sorted(selected_genders)),
+    )
+    filtered_df = apply_filters(filter_key)
     
     st.sidebar.metric("Filtered Results", len(filtered_df))
     
@@ -112,196 +558,34 @@ if df is not None:
         st.write(f"👥 Genders selected: {len(selected_genders)}/{len(genders)}")
         st.write(f"📊 Filtered rows: {len(filtered_df)}")
     
-    # If no data after filtering, use all data
+    # If no data after filtering, use all data (df is read-only here,
+    # so an alias is enough - no need to copy every column)
     if len(filtered_df) == 0:
-        filtered_df = df.copy()
+        filtered_df = df
     
     # Create tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Overview", "⭐ Ratings", "🎨 Brands", "🌍 Geographic", "📝 Notes"])
     
     # TAB 1: Overview
     with tab1:
-        st.header("Overview Analytics")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Rating distribution
-            if len(filtered_df) > 0 and filtered_df['Rating Value'].notna().sum() > 0:
-                fig_rating = px.histogram(
-                    filtered_df.dropna(subset=['Rating Value']), 
-                    x='Rating Value',
-                    nbins=30,
-                    title='Rating Distribution',
-                    color_discrete_sequence=['#FF6B9D']
-                )
-                st.plotly_chart(fig_rating, use_container_width=True)
-            else:
-                st.info("No rating data available")
-        
-        with col2:
-            # Gender distribution
-            if 'Gender' in filtered_df.columns:
-                gender_counts = filtered_df['Gender'].value_counts()
-                if len(gender_counts) > 0:
-                    fig_gender = px.pie(
-                        values=gender_counts.values,
-                        names=gender_counts.index,
-                        title='Fragrances by Gender',
-                        color_discrete_sequence=px.colors.qualitative.Set2
-                    )
-                    st.plotly_chart(fig_gender, use_container_width=True)
-    
+        render_overview(filter_key)
+
     # TAB 2: Ratings Analysis
     with tab2:
-        st.header("Ratings Analysis")
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            avg_rating = filtered_df['Rating Value'].mean()
-            st.metric("Avg Rating", f"{avg_rating:.2f}" if pd.notna(avg_rating) else "N/A")
-        with col2:
-            med_rating = filtered_df['Rating Value'].median()
-            st.metric("Median Rating", f"{med_rating:.2f}" if pd.notna(med_rating) else "N/A")
-        with col3:
-            std_rating = filtered_df['Rating Value'].std()
-            st.metric("Std Dev", f"{std_rating:.2f}" if pd.notna(std_rating) else "N/A")
-        
-        # Top rated
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("Top 10 Highest Rated")
-            top_rated = filtered_df.nlargest(10, 'Rating Value')[['Perfume', 'Brand', 'Rating Value']]
-            st.dataframe(top_rated, use_container_width=True)
-        
-        with col2:
-            st.subheader("Top 10 Most Reviewed")
-            most_reviewed = filtered_df.nlargest(10, 'Rating Count')[['Perfume', 'Brand', 'Rating Count']]
-            st.dataframe(most_reviewed, use_container_width=True)
-    
+        render_ratings(filter_key)
+
     # TAB 3: Top Brands
     with tab3:
-        st.header("Top Brands Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            brand_counts = filtered_df['Brand'].value_counts().head(15)
-            if len(brand_counts) > 0:
-                fig_brands = px.bar(
-                    x=brand_counts.values,
-                    y=brand_counts.index,
-                    orientation='h',
-                    title='Top 15 Brands',
-                    color_discrete_sequence=['#FF6B9D']
-                )
-                fig_brands.update_layout(height=500)
-                st.plotly_chart(fig_brands, use_container_width=True)
-        
-        with col2:
-            brand_ratings = filtered_df.dropna(subset=['Rating Value']).groupby('Brand')['Rating Value'].agg(['mean', 'count']).sort_values('mean', ascending=False).head(15)
-            if len(brand_ratings) > 0:
-                fig_brand_rating = px.bar(
-                    x=brand_ratings['mean'],
-                    y=brand_ratings.index,
-                    orientation='h',
-                    title='Top 15 Brands by Avg Rating',
-                    color_discrete_sequence=['#00CC96']
-                )
-                fig_brand_rating.update_layout(height=500)
-                st.plotly_chart(fig_brand_rating, use_container_width=True)
-    
+        render_brands(filter_key)
+
     # TAB 4: Geographic Analysis
     with tab4:
-        st.header("Geographic Distribution")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            country_counts = filtered_df['Country'].value_counts().head(15)
-            if len(country_counts) > 0:
-                fig_countries = px.bar(
-                    x=country_counts.values,
-                    y=country_counts.index,
-                    orientation='h',
-                    title='Top 15 Countries',
-                    color_discrete_sequence=['#636EFA']
-                )
-                fig_countries.update_layout(height=500)
-                st.plotly_chart(fig_countries, use_container_width=True)
-        
-        with col2:
-            country_ratings = filtered_df.dropna(subset=['Rating Value']).groupby('Country')['Rating Value'].agg(['mean', 'count']).sort_values('mean', ascending=False).head(15)
-            if len(country_ratings) > 0:
-                fig_country_rating = px.bar(
-                    x=country_ratings['mean'],
-                    y=country_ratings.index,
-                    orientation='h',
-                    title='Top 15 Countries by Avg Rating',
-                    color_discrete_sequence=['#AB63FA']
-                )
-                fig_country_rating.update_layout(height=500)
-                st.plotly_chart(fig_country_rating, use_container_width=True)
-    
+        render_geographic(filter_key)
+
     # TAB 5: Notes Analysis
     with tab5:
-        st.header("Fragrance Notes Analysis")
-        
-        def get_top_notes(col_name, top_n=15):
-            """Extract and count notes from column"""
-            all_notes = []
-            if col_name in filtered_df.columns:
-                for notes in filtered_df[col_name].dropna():
-                    if isinstance(notes, str) and notes.strip():
-                        # Split by space or common delimiters
-                        note_list = [n.strip() for n in notes.split() if n.strip()]
-                        all_notes.extend(note_list)
-            return dict(Counter(all_notes).most_common(top_n))
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.subheader("Top Notes")
-            top_notes = get_top_notes('Top', 15)
-            if top_notes:
-                fig_top = px.bar(
-                    x=list(top_notes.values()),
-                    y=list(top_notes.keys()),
-                    orientation='h',
-                    title='Top Notes',
-                    color_discrete_sequence=['#FFA15A']
-                )
-                fig_top.update_layout(height=500)
-                st.plotly_chart(fig_top, use_container_width=True)
-        
-        with col2:
-            st.subheader("Middle Notes")
-            middle_notes = get_top_notes('Middle', 15)
-            if middle_notes:
-                fig_middle = px.bar(
-                    x=list(middle_notes.values()),
-                    y=list(middle_notes.keys()),
-                    orientation='h',
-                    title='Middle Notes',
-                    color_discrete_sequence=['#00CC96']
-                )
-                fig_middle.update_layout(height=500)
-                st.plotly_chart(fig_middle, use_container_width=True)
-        
-        with col3:
-            st.subheader("Base Notes")
-            base_notes = get_top_notes('Base', 15)
-            if base_notes:
-                fig_base = px.bar(
-                    x=list(base_notes.values()),
-                    y=list(base_notes.keys()),
-                    orientation='h',
-                    title='Base Notes',
-                    color_discrete_sequence=['#636EFA']
-                )
-                fig_base.update_layout(height=500)
-                st.plotly_chart(fig_base, use_container_width=True)
-    
+        render_notes(filter_key)
+
     # Footer
     st.divider()
 